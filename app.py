@@ -3,11 +3,18 @@ SLIK Extractor Pro — Streamlit Application
 A web-based tool for parsing Indonesian OJK SLIK/iDeb PDF reports.
 """
 
+import hashlib
+import hmac
+import os
+import re
+import tempfile
 import streamlit as st
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
-from slik_parser import extract_text_from_pdf, parse_slik_data, export_to_excel, build_debtor_summary
+from slik_parser import process_pdf, export_to_excel, build_debtor_summary
 
 # ---------------------------------------------------------------------------
 # Page Config
@@ -22,7 +29,7 @@ st.set_page_config(
 # ---------------------------------------------------------------------------
 # Custom CSS
 # ---------------------------------------------------------------------------
-st.markdown("""
+_CUSTOM_CSS = """
 <style>
     /* Modern dark theme overrides */
     .stApp {
@@ -144,16 +151,37 @@ st.markdown("""
     footer {visibility: hidden;}
     header {visibility: hidden;}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+@st.cache_resource
+def _minified_css() -> str:
+    """
+    Custom CSS without comments and indentation, built once per process.
+    The style block has to be re-emitted on every rerun (elements a run
+    doesn't emit are removed), so keep that payload small.
+    """
+    css = re.sub(r'/\*.*?\*/', '', _CUSTOM_CSS, flags=re.DOTALL)
+    return re.sub(r'\s*\n\s*', '', css)
+
+
+st.markdown(_minified_css(), unsafe_allow_html=True)
 
 # ---------------------------------------------------------------------------
 # Authentication
 # ---------------------------------------------------------------------------
+_ACCESS_CODE_FILE = Path(__file__).parent / "access_code.txt"
+
+
+@st.cache_data(show_spinner=False, ttl=60)
 def _load_access_code() -> str:
-    """Read the access code from access_code.txt (same directory as app.py)."""
+    """
+    Read the access code from access_code.txt (same directory as app.py).
+    Cached for a minute, so login attempts don't hit the filesystem each time
+    while edits to the file still take effect without a restart.
+    """
     try:
-        code_file = Path(__file__).parent / "access_code.txt"
-        return code_file.read_text(encoding="utf-8").strip()
+        return _ACCESS_CODE_FILE.read_text(encoding="utf-8").strip()
     except Exception:
         return "slik2026"  # fallback default
 
@@ -183,7 +211,8 @@ if not st.session_state["authenticated"]:
 
         if login_clicked:
             correct_code = _load_access_code()
-            if code_input == correct_code:
+            # Constant-time comparison — don't leak the code via timing
+            if hmac.compare_digest(code_input.encode(), correct_code.encode()):
                 st.session_state["authenticated"] = True
                 st.rerun()
             else:
@@ -200,10 +229,17 @@ if not st.session_state["authenticated"]:
     st.stop()
 
 # --- Sidebar logout ---
-with st.sidebar:
+# A fragment, so sidebar widgets rerun on their own instead of the whole
+# page; logging out still needs a full app rerun to show the login form.
+@st.fragment
+def _sidebar():
     if st.button("🚪 Logout"):
         st.session_state["authenticated"] = False
-        st.rerun()
+        st.rerun(scope="app")
+
+
+with st.sidebar:
+    _sidebar()
 
 # ---------------------------------------------------------------------------
 # Header
@@ -244,38 +280,136 @@ if uploaded_files:
 else:
     process_clicked = False
 
+# ---------------------------------------------------------------------------
+# Cached Extraction
+# ---------------------------------------------------------------------------
+@st.cache_resource
+def _get_process_pool() -> ProcessPoolExecutor:
+    """One worker pool per server process, shared by all sessions and reruns."""
+    return ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _extract_and_parse(file_digest: str, filename: str, _pdf_path: str) -> pd.DataFrame | None:
+    """
+    Extract + parse one PDF in the worker pool.
+    Cached on the file's content digest, so re-processing an identical PDF is
+    instant. The path is excluded from the cache key (leading underscore).
+    """
+    pool = _get_process_pool()
+    try:
+        return pool.submit(process_pdf, _pdf_path).result()
+    except BrokenProcessPool:
+        # A worker died (OOM kill, crash on a bad PDF) and the shared pool is
+        # unusable for every session from now on — replace it (unless another
+        # thread already has) and retry once on the fresh pool.
+        if _get_process_pool() is pool:
+            _get_process_pool.clear()
+        return _get_process_pool().submit(process_pdf, _pdf_path).result()
+
+
+def _spool_upload(uploaded_file, dest: Path) -> str:
+    """
+    Copy an upload to disk in 1 MiB chunks and return its SHA-256 digest.
+    Workers then open the file by path instead of receiving a pickled copy.
+    """
+    uploaded_file.seek(0)
+    digest = hashlib.sha256()
+    try:
+        with open(dest, "wb") as out:
+            while chunk := uploaded_file.read(1 << 20):
+                digest.update(chunk)
+                out.write(chunk)
+    except Exception:
+        # Don't leave a partial copy behind taking up space (e.g. disk full)
+        dest.unlink(missing_ok=True)
+        raise
+    return digest.hexdigest()
+
+# ---------------------------------------------------------------------------
+# Cached Export
+# ---------------------------------------------------------------------------
+@st.cache_data(show_spinner=False, max_entries=8)
+def _build_excel(df_results: pd.DataFrame, summary_df: pd.DataFrame | None) -> bytes:
+    """Render the Excel workbook; cached on the contents of both DataFrames."""
+    return export_to_excel(df_results, summary_df)
+
 # ---------------------------------------------------------------------------
 # Processing Pipeline
 # ---------------------------------------------------------------------------
 if process_clicked and uploaded_files:
-    all_records = pd.DataFrame()
+    # One slot per upload: results arrive out of order, but the merged
+    # output should follow the upload order.
+    frames: list[pd.DataFrame | None] = [None] * len(uploaded_files)
 
     with st.spinner("⏳ Extracting text and parsing facilities..."):
         progress_bar = st.progress(0, text="Starting...")
 
-        for idx, uploaded_file in enumerate(uploaded_files):
-            progress_text = f"Processing: {uploaded_file.name} ({idx + 1}/{len(uploaded_files)})"
-            progress_bar.progress((idx) / len(uploaded_files), text=progress_text)
-
+        # PDFs are independent, so extract + parse them in parallel.
+        # The threads only look up the cache and wait on the process pool.
+        # Uploads are spooled to a temp dir (removed on exit) and passed by
+        # path, so no extra in-memory copies of the PDFs are made.
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = {}
             try:
-                # Step 1: Extract text
-                full_text, nama_debitur = extract_text_from_pdf(uploaded_file)
-
-                if not full_text.strip():
-                    st.warning(f"⚠️ {uploaded_file.name}: No text extracted. Skipping.")
-                    continue
-
-                # Step 2: Parse facilities
-                df = parse_slik_data(full_text, nama_debitur)
-
-                if not df.empty:
-                    all_records = pd.concat([all_records, df], ignore_index=True)
-
-            except Exception as e:
-                st.error(f"❌ Error processing {uploaded_file.name}: {str(e)}")
+                for idx, uploaded_file in enumerate(uploaded_files):
+                    try:
+                        # Cheap signature check before paying for a parser failure.
+                        # Readers accept junk before the header within the first KiB.
+                        uploaded_file.seek(0)
+                        if b"%PDF-" not in uploaded_file.read(1024):
+                            st.warning(f"⚠️ {uploaded_file.name}: Not a valid PDF file. Skipping.")
+                            continue
+
+                        pdf_path = Path(tmp_dir) / f"{idx}.pdf"
+                        file_digest = _spool_upload(uploaded_file, pdf_path)
+                    except Exception as e:
+                        # e.g. disk full while spooling — skip just this file
+                        st.error(f"❌ Error processing {uploaded_file.name}: {str(e)}")
+                        continue
+
+                    future = executor.submit(_extract_and_parse, file_digest, uploaded_file.name, str(pdf_path))
+                    futures[future] = idx
+
+                # Every progress update is a round-trip to the browser — cap the
+                # batch at ~50 updates, issued as files complete.
+                progress_step = max(1, len(futures) // 50)
+
+                for done, future in enumerate(as_completed(futures), 1):
+                    idx = futures[future]
+                    file_name = uploaded_files[idx].name
+                    if done % progress_step == 0:
+                        progress_text = f"Processed: {file_name} ({done}/{len(futures)})"
+                        progress_bar.progress(done / len(futures), text=progress_text)
+
+                    try:
+                        df = future.result()
+
+                        if df is None:
+                            st.warning(f"⚠️ {file_name}: No text extracted. Skipping.")
+                            continue
+
+                        if not df.empty:
+                            frames[idx] = df
+
+                    except Exception as e:
+                        st.error(f"❌ Error processing {file_name}: {str(e)}")
+            except BaseException:
+                # Stop / rerun (Streamlit's ScriptControlException is a
+                # BaseException) or any error: drop the files still queued so
+                # the executor's exit only waits for those already running,
+                # which keeps their temp files valid until they finish.
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
 
         progress_bar.progress(1.0, text="✅ Processing complete!")
 
+    # Single concat at the end — concatenating inside the loop re-copies
+    # everything collected so far on every file.
+    frames = [df for df in frames if df is not None]
+    all_records = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
     # Store results in session state
     st.session_state["results"] = all_records
     st.session_state["processed"] = True
@@ -325,14 +459,14 @@ if st.session_state.get("processed") and "results" in st.session_state:
 
         st.markdown("")
 
-        # Data Preview (hide the Raw column)
+        # Data Preview (hide the Raw column via column_config — no copy)
         st.markdown("### 📋 Data Preview")
-        display_df = df_results.drop(columns=["Baki Debet (Raw)"], errors="ignore")
         st.dataframe(
-            display_df,
+            df_results,
             use_container_width=True,
             hide_index=True,
-            height=min(400, 50 + len(display_df) * 35),
+            height=min(400, 50 + len(df_results) * 35),
+            column_config={"Baki Debet (Raw)": None},
         )
 
         # ------------------------------------------------------------------
@@ -343,11 +477,11 @@ if st.session_state.get("processed") and "results" in st.session_state:
             st.markdown("### 💰 Outstanding per Debtor")
 
             # Summary table (hide raw column)
-            display_summary = summary_df.drop(columns=["Total Outstanding (Raw)"], errors="ignore")
             st.dataframe(
-                display_summary,
+                summary_df,
                 use_container_width=True,
                 hide_index=True,
+                column_config={"Total Outstanding (Raw)": None},
             )
 
             # Grand total
@@ -363,9 +497,9 @@ if st.session_state.get("processed") and "results" in st.session_state:
         else:
             summary_df = None
 
-        # Download button
+        # Download button — the workbook is only built when the button is
+        # clicked (in a background thread), not on every rerun
         st.markdown("")
-        excel_bytes = export_to_excel(df_results, summary_df)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"SLIK_Active_Facilities_{timestamp}.xlsx"
 
@@ -373,7 +507,7 @@ if st.session_state.get("processed") and "results" in st.session_state:
         with col_dl:
             st.download_button(
                 label="📥 Download Excel",
-                data=excel_bytes,
+                data=lambda: _build_excel(df_results, summary_df),
                 file_name=filename,
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True,
@@ -384,6 +518,6 @@ if st.session_state.get("processed") and "results" in st.session_state:
 # ---------------------------------------------------------------------------
 st.markdown("""
 <div class="footer">
-    SLIK Extractor Pro • All processing happens locally in memory • No data leaves your machine
+    SLIK Extractor Pro • All processing happens locally • Temporary files are deleted after processing • No data leaves your machine
 </div>
 """, unsafe_allow_html=True)
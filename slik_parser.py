@@ -1,15 +1,36 @@
 """
 SLIK/iDeb PDF Parser — Core Extraction Module
-Parses Indonesian OJK SLIK PDF reports using pdfplumber + regex.
+Parses Indonesian OJK SLIK PDF reports using PyMuPDF or pypdfium2
+(pdfplumber fallback) + regex.
 Extracts active credit facilities and returns a DataFrame.
 """
 
 import re
-import pdfplumber
+import pypdfium2 as pdfium
 import pandas as pd
+import xlsxwriter
+from collections import Counter
 from io import BytesIO
 from pathlib import Path
 
+# Optional: MuPDF is a little faster than PDFium, but AGPL-licensed,
+# so it is only used when installed separately
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+
+
+# Header that precedes every facility block:
+# "Kredit/Pembiayaan" followed by "Pelapor  Cabang  Baki Debet  Tanggal Update"
+_RE_CHUNK_SPLIT = re.compile(
+    r'Kredit/Pembiayaan\s*\n\s*Pelapor\s+Cabang\s+Baki Debet\s+Tanggal Update'
+)
+
+# Words whose tops are within this many points share a text line
+# (pdfplumber's default y_tolerance, so all backends lay out lines alike)
+_LINE_TOLERANCE = 3
+
 
 # ---------------------------------------------------------------------------
 # 1. Text Extraction
@@ -20,21 +41,16 @@ def extract_text_from_pdf(pdf_source) -> tuple[str, str]:
     Extract all text from a SLIK PDF, filtering out the RAHASIA watermark.
 
     Args:
-        pdf_source: File path (str) or file-like object (BytesIO / UploadedFile).
+        pdf_source: File path (str / Path) or file-like object (BytesIO / UploadedFile).
 
     Returns:
         (full_text, nama_debitur)
     """
-    full_text = ""
-    first_page_text = ""
-
-    pdf = pdfplumber.open(pdf_source)
-    for i, page in enumerate(pdf.pages):
-        text = page.extract_text() or ""
-        if i == 0:
-            first_page_text = text
-        full_text += text + "\n"
-    pdf.close()
+    pages = _extract_pages(pdf_source)
+    first_page_text = pages[0] if pages else ""
+    # One join, no per-page "text + newline" temporaries; every page keeps
+    # its trailing newline as before
+    full_text = "\n".join(pages) + "\n" if pages else ""
 
     # Strip RAHASIA watermark and its disclaimer line
     full_text = _strip_rahasia(full_text)
@@ -45,19 +61,164 @@ def extract_text_from_pdf(pdf_source) -> tuple[str, str]:
     return full_text, nama_debitur
 
 
+def _extract_pages(pdf_source) -> list[str]:
+    """
+    Extract the text of every page, one string per page.
+
+    Uses PyMuPDF when it is installed, otherwise pypdfium2 — both C-backed
+    and far faster than pdfplumber. Falls back to pdfplumber if the fast
+    text has none of the facility headers the parser anchors on.
+    """
+    extract_fast = _extract_pages_pymupdf if pymupdf is not None else _extract_pages_pdfium
+    pages = extract_fast(pdf_source)
+    if _RE_CHUNK_SPLIT.search("\n".join(pages)):
+        return pages
+
+    if hasattr(pdf_source, "seek"):
+        pdf_source.seek(0)
+    return _extract_pages_pdfplumber(pdf_source)
+
+
+def _extract_pages_pymupdf(pdf_source) -> list[str]:
+    """Extract page texts with PyMuPDF, rebuilt into pdfplumber-style lines."""
+    if isinstance(pdf_source, (str, Path)):
+        doc = pymupdf.open(pdf_source)
+    else:
+        doc = pymupdf.open(stream=pdf_source.read(), filetype="pdf")
+
+    with doc:
+        # get_text("words") -> (x0, top, x1, bottom, word, block, line, word_no)
+        return [
+            _words_to_lines((w[1], w[0], w[4]) for w in page.get_text("words"))
+            for page in doc
+        ]
+
+
+def _extract_pages_pdfium(pdf_source) -> list[str]:
+    """Extract page texts with pypdfium2, rebuilt into pdfplumber-style lines."""
+    pdf = pdfium.PdfDocument(pdf_source)
+    try:
+        pages = []
+        for page in pdf:
+            pages.append(_words_to_lines(_pdfium_words(page)))
+            page.close()
+        return pages
+    finally:
+        pdf.close()
+
+
+def _pdfium_words(page) -> list[tuple[float, float, str]]:
+    """
+    Collect (top, x0, text) words from a PDFium page.
+
+    PDFium only exposes characters, and the spaces it generates between
+    words have unreliable boxes, so words are split on whitespace in text
+    order and positioned by their first character's (font-height) box.
+    """
+    textpage = page.get_textpage()
+    try:
+        text = textpage.get_text_range()
+        height = page.get_height()
+
+        words = []
+        chars = []
+        top = x0 = 0.0
+        for i, ch in enumerate(text[:textpage.count_chars()]):
+            if ch.isspace():
+                if chars:
+                    words.append((top, x0, "".join(chars)))
+                    chars = []
+                continue
+            if not chars:
+                # PDF coordinates grow upwards; convert to top-down like pdfplumber
+                x0, _, _, char_top = textpage.get_charbox(i, loose=True)
+                top = height - char_top
+            chars.append(ch)
+        if chars:
+            words.append((top, x0, "".join(chars)))
+        return words
+    finally:
+        textpage.close()
+
+
+def _extract_pages_pdfplumber(pdf_source) -> list[str]:
+    """Extract page texts with pdfplumber (slow, but the reference layout)."""
+    # Imported here: pdfplumber/pdfminer take ~75 ms to import and are only
+    # needed for the rare PDFs the fast backends cannot lay out
+    import pdfplumber
+
+    pages = []
+    with pdfplumber.open(pdf_source) as pdf:
+        for page in pdf.pages:
+            pages.append(page.extract_text() or "")
+            # Drop the page's cached chars/lines/rects before the next one,
+            # so peak memory is one page's layout rather than the whole PDF
+            page.close()
+    return pages
+
+
+def _words_to_lines(words) -> str:
+    """
+    Join positioned words into text lines the way pdfplumber lays them out.
+
+    The fast backends emit text in content-stream order (one table cell per
+    line), which breaks the line-based regexes below. Grouping words by their top
+    coordinate and joining each group left-to-right restores the row layout.
+
+    Args:
+        words: Iterable of (top, x0, text) tuples.
+    """
+    lines = []
+    current = []
+    line_top = None
+    for top, x0, text in sorted(words):
+        if current and top - line_top <= _LINE_TOLERANCE:
+            current.append((x0, text))
+        else:
+            if current:
+                lines.append(current)
+            current = [(x0, text)]
+            line_top = top
+    if current:
+        lines.append(current)
+
+    return "\n".join(" ".join(text for _, text in sorted(line)) for line in lines)
+
+
+# One pass instead of three sequential subs. The alternatives reproduce
+# the old order of operations:
+#   - the disclaimer line, which reads "bersifat RAHASIA dan ..." before
+#     the watermark is removed from it
+#   - standalone "RAHASIA" (watermark overlay), leaving adjacent dots alone
+#   - leftover RAHASIA inside numbers (e.g. 1.500.RAHASIA000), dots
+#     included — a safety net, as the watermark may be interleaved into data
+# The leading lookahead lets the engine skip most positions on a cheap
+# first-character test instead of trying every alternative.
+_RE_RAHASIA = re.compile(
+    r'(?=[.IRr])(?:'
+    r'Informasi ini bersifat\s+(?:RAHASIA\s+)?dan hanya digunakan untuk kepentingan pemohon informasi\.?'
+    r'|\bRAHASIA\b'
+    r'|\.?(?!\bRAHASIA\b)(?i:RAHASIA)\.?'
+    r')'
+)
+
+
 def _strip_rahasia(text: str) -> str:
     """Remove the RAHASIA watermark word and the standard disclaimer line."""
-    # Remove standalone "RAHASIA" (watermark overlay)
-    text = re.sub(r'\bRAHASIA\b', '', text)
-    # Remove the standard disclaimer line
-    text = re.sub(
-        r'Informasi ini bersifat\s+dan hanya digunakan untuk kepentingan pemohon informasi\.?',
-        '', text
-    )
-    # Remove leftover RAHASIA that may appear inside numbers (e.g. 1.500.RAHASIA000)
-    # This is a safety net — pdfplumber may interleave the watermark into data
-    text = re.sub(r'\.?RAHASIA\.?', '', text, flags=re.IGNORECASE)
-    return text
+    return _RE_RAHASIA.sub('', text)
+
+
+# The name sits on the line right after its header row, so each pattern
+# skips just the rest of the header line ([^\n]*\n) rather than a DOTALL
+# .*? that can wander over the whole page when the name line doesn't match.
+_RE_NAMA_COMPANY = re.compile(
+    r'Nama Debitur\s+NPWP\s+Bentuk BU[^\n]*\n\s*([A-Z][A-Z\s]+?)\s+\d{10,}'
+)
+_RE_NAMA_INDIVIDUAL = re.compile(
+    r'Nama Sesuai Identitas[^\n]*\n\s*([A-Z][A-Z\s,\.]+?)(?:\s+NIK|\s+SIM|\s+Paspor)'
+)
+_RE_NAMA_FALLBACK = re.compile(r'^Nama\s*\n\s*([A-Z][A-Z\s]+?)\s+(?:Posisi|NPWP)', re.MULTILINE)
+_RE_NAMA_LAST_RESORT = re.compile(r'Nama\s+Jenis Kelamin[^\n]*\n([A-Z][A-Z\s]+)')
 
 
 def _extract_nama_debitur(first_page_text: str) -> str:
@@ -70,34 +231,25 @@ def _extract_nama_debitur(first_page_text: str) -> str:
     # Header row: "Nama Debitur  NPWP  Bentuk BU / Go Public ..."
     # Data row:   "YAYASAN BUMI MAITRI  024828006214000  Yayasan / ..."
     #         or: "INDO PERMATA AYU  0029032988215000  Perseroan Terbatas / ..."
-    company_match = re.search(
-        r'Nama Debitur\s+NPWP\s+Bentuk BU.*?\n\s*([A-Z][A-Z\s]+?)\s+\d{10,}',
-        first_page_text, re.DOTALL
-    )
+    company_match = _RE_NAMA_COMPANY.search(first_page_text)
     if company_match:
         return company_match.group(1).strip()
 
     # --- Individual PDFs ---
     # Header row: "Nama Sesuai Identitas  Identitas  Jenis Kelamin ..."
     # Data row:   "SAKUAN  NIK / LAKI-LAKI / ..."
-    individual_match = re.search(
-        r'Nama Sesuai Identitas.*?\n\s*([A-Z][A-Z\s,\.]+?)(?:\s+NIK|\s+SIM|\s+Paspor)',
-        first_page_text, re.DOTALL
-    )
+    individual_match = _RE_NAMA_INDIVIDUAL.search(first_page_text)
     if individual_match:
         return individual_match.group(1).strip()
 
     # --- Fallback: "Nama" line on page 1 header ---
     # PT PDFs sometimes show: "Nama\nINDO PERMATA AYU  Posisi Data"
-    fallback_match = re.search(
-        r'(?:^|\n)Nama\s*\n\s*([A-Z][A-Z\s]+?)\s+(?:Posisi|NPWP)',
-        first_page_text
-    )
+    fallback_match = _RE_NAMA_FALLBACK.search(first_page_text)
     if fallback_match:
         return fallback_match.group(1).strip()
 
     # --- Last resort: "Nama  Jenis Kelamin" header ---
-    match = re.search(r'Nama\s+Jenis Kelamin.*?\n([A-Z][A-Z\s]+)', first_page_text)
+    match = _RE_NAMA_LAST_RESORT.search(first_page_text)
     if match:
         return match.group(1).strip()
 
@@ -115,17 +267,8 @@ def parse_slik_data(full_text: str, nama_debitur: str) -> pd.DataFrame:
 
     Returns a pandas DataFrame.
     """
-    # Split by the section header that precedes each facility
-    # Each facility block starts with "Kredit/Pembiayaan" followed by
-    # "Pelapor  Cabang  Baki Debet  Tanggal Update"
-    # and then the actual data line.
-    chunks = re.split(r'Kredit/Pembiayaan\s*\n\s*Pelapor\s+Cabang\s+Baki Debet\s+Tanggal Update', full_text)
-
-    # The first chunk is the header/summary section — skip it
-    facility_chunks = chunks[1:]
-
     records = []
-    for chunk in facility_chunks:
+    for chunk in _iter_facility_chunks(full_text):
         record = _parse_chunk(chunk, nama_debitur)
         if record is not None:
             records.append(record)
@@ -133,21 +276,104 @@ def parse_slik_data(full_text: str, nama_debitur: str) -> pd.DataFrame:
     if not records:
         return pd.DataFrame()
 
-    df = pd.DataFrame(records)
-
-    # Reorder columns
+    # Column order is set at construction; _parse_chunk fills every key
     column_order = [
         "Nama Debitur", "Pelapor", "Fasilitas", "Kol",
         "Hari Tunggakan", "Tanggal Mulai", "Tanggal JTO",
         "Plafon", "Suku Bunga", "Baki Debet", "Baki Debet (Raw)", "Agunan"
     ]
-    # Only include columns that exist
-    column_order = [c for c in column_order if c in df.columns]
-    df = df[column_order]
+    # Arrow-backed columns keep the strings in contiguous buffers, which
+    # makes the concat/groupby/nunique steps downstream much cheaper
+    df = pd.DataFrame(records, columns=column_order).convert_dtypes(dtype_backend="pyarrow")
 
     return df
 
 
+def _iter_facility_chunks(full_text: str):
+    """
+    Yield the text of each facility block, one at a time.
+
+    Each facility block starts with "Kredit/Pembiayaan" followed by
+    "Pelapor  Cabang  Baki Debet  Tanggal Update" and then the actual data
+    line. Only the header offsets are collected up front; the blocks are
+    sliced lazily, so the text is never held twice as a list of chunks.
+    The text before the first header (summary section) is skipped.
+    """
+    spans = [m.span() for m in _RE_CHUNK_SPLIT.finditer(full_text)]
+
+    # A block runs from the end of its header to the start of the next one
+    next_starts = [s for s, _ in spans[1:]] + [len(full_text)]
+    for (_, end), next_start in zip(spans, next_starts):
+        yield full_text[end:next_start]
+
+
+def process_pdf(pdf_source) -> pd.DataFrame | None:
+    """
+    Extract and parse a single SLIK PDF in one call.
+    Kept at module level so it can be submitted to a process pool.
+
+    Args:
+        pdf_source: File path (str / Path), raw PDF bytes, or file-like object.
+
+    Returns:
+        The parsed DataFrame, or None if no text could be extracted.
+    """
+    if isinstance(pdf_source, bytes):
+        pdf_source = BytesIO(pdf_source)
+
+    full_text, nama_debitur = extract_text_from_pdf(pdf_source)
+    # isspace() stops at the first visible character instead of copying
+    # the whole document the way strip() does
+    if not full_text or full_text.isspace():
+        return None
+
+    return parse_slik_data(full_text, nama_debitur)
+
+
+_RE_PELAPOR = re.compile(r'(\d{2,6}\s*-\s*.*?)\s+Rp\s*([\d\.,]+)')
+_RE_CODE_PREFIX = re.compile(r'(\d{2,6}\s*-\s*)')
+_RE_KOL = re.compile(r'Kualitas\s+(\d)\s*-')
+_RE_FASILITAS_AKTIF = re.compile(r'Kondisi\s+Fasilitas Aktif')
+# Matched right where _RE_PELAPOR ends (after "Rp <baki debet>"): the
+# update date closing the data line, then the wrapped bank name line
+_RE_CONTINUATION = re.compile(
+    r'\s+\d{2}\s+\w+\s+\d{4}\s*\n\s*([A-Z][A-Za-z\s\.\(\)]+?)\s*\n'
+)
+# Month rows / section headers that are not a bank name continuation
+_RE_NOT_CONTINUATION = re.compile(
+    r'(Feb|Mar|Apr|Mei|Jun|Jul|Agt|Sep|Okt|Nov|Des|Kualitas|No Rekening|Sifat)'
+)
+_RE_TUNGGAKAN = re.compile(r'Jumlah Hari Tunggakan\s+(\d+)')
+_RE_TGL_MULAI = re.compile(r'Tanggal Mulai\s+(\d{2}\s+\w+\s+\d{4})')
+_RE_TGL_JTO = re.compile(r'Tanggal Jatuh Tempo\s+(\d{2}\s+\w+\s+\d{4})')
+_RE_PLAFON = re.compile(r'Plafon Awal\s+Rp\s*([\d\.,]+)')
+_RE_BUNGA = re.compile(r'Suku Bunga/Imbalan\s+([\d\.,]+)\s*%')
+_RE_JENIS_PENGGUNAAN = re.compile(r'Jenis Penggunaan\s+(.*?)\s+Frekuensi\s+Restrukturisasi', re.DOTALL)
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_JENIS_KREDIT = re.compile(r'Jenis Kredit/Pembiayaan\s+(.*?)(?:\n|$)')
+_RE_BUKTI = re.compile(r'Bukti Kepemilikan\s+(.*?)(?:\s+Nilai|\n)')
+_RE_JENIS_AGUNAN = re.compile(r'Jenis Agunan\s+Nilai Agunan.*?\n\s*(.*?)\s+Rp')
+
+# Known cabang suffixes (order: longer/more specific first), as one
+# alternation. Each specific alternative starts before the generic KC/KPO/
+# Pusat it contains, so the leftmost match is also the highest-priority one.
+_RE_CABANG = re.compile(
+    r'''\s+(?:
+          BANK\s+BUKOPIN\s+\S.*        # BANK BUKOPIN KC TJ.PINANG
+        | BANK\s+OCBC\s+NISP\s+\S.*    # BANK OCBC NISP KC BTM-RGC.PARK
+        | BANK\s+CIMB\s+NIAGA\s+\S.*   # BANK CIMB NIAGA KPO
+        | BPD\s+\w+\s+KC\s+\S.*        # BPD JATIM KC BATAM
+        | BMI\s+KC\s+\S.*              # BMI KC TANJUNG PINANG
+        | BRI\s+KAS\s+\S.*             # BRI KAS KPO
+        | BCA\s+KANTOR\s+\S.*          # BCA KANTOR PUSAT
+        | KC\s+\S.*                    # KC Sutami
+        | KPO                          # KPO (standalone)
+        | Pusat                        # Pusat (standalone)
+    )$''',
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
 def _parse_chunk(chunk: str, nama_debitur: str) -> dict | None:
     """
     Parse a single facility chunk.
@@ -161,10 +387,9 @@ def _parse_chunk(chunk: str, nama_debitur: str) -> dict | None:
     data["Nama Debitur"] = nama_debitur
 
     # --- Pelapor & Baki Debet (from the first data line) ---
-    pelapor_match = re.search(
-        r'(\d{2,6}\s*-\s*.*?)\s+Rp\s*([\d\.,]+)',
-        chunk
-    )
+    # The pattern needs an "Rp" amount; a plain substring test rules out
+    # chunks without one before the regex engine gets involved
+    pelapor_match = _RE_PELAPOR.search(chunk) if "Rp" in chunk else None
     if pelapor_match:
         raw_pelapor = pelapor_match.group(1).strip()
         baki_debet_str = pelapor_match.group(2).strip()
@@ -175,12 +400,14 @@ def _parse_chunk(chunk: str, nama_debitur: str) -> dict | None:
     baki_debet_int = _parse_currency_to_int(baki_debet_str)
 
     # --- Kualitas (Kol) — parse early, needed for filter ---
-    kol_match = re.search(r'Kualitas\s+(\d)\s*-', chunk)
+    kol_match = _RE_KOL.search(chunk)
     kol_str = kol_match.group(1) if kol_match else "-"
     kol_int = int(kol_str) if kol_str.isdigit() else 0
 
     # --- Check "Kondisi  Fasilitas Aktif" ---
-    is_fasilitas_aktif = bool(re.search(r'Kondisi\s+Fasilitas Aktif', chunk))
+    # Substring test first: most chunks are closed facilities without the
+    # phrase, and only those with it need the "Kondisi" context checked
+    is_fasilitas_aktif = "Fasilitas Aktif" in chunk and bool(_RE_FASILITAS_AKTIF.search(chunk))
 
     # --- Filter: keep if Fasilitas Aktif OR Kol >= 2 ---
     if not is_fasilitas_aktif and kol_int < 2:
@@ -193,47 +420,25 @@ def _parse_chunk(chunk: str, nama_debitur: str) -> dict | None:
     # The cabang (Pusat) is wrongly included; real name continues on next line.
 
     # Extract the numeric code prefix
-    code_match = re.match(r'(\d{2,6}\s*-\s*)', raw_pelapor)
+    code_match = _RE_CODE_PREFIX.match(raw_pelapor)
     code_prefix = code_match.group(1) if code_match else ""
     name_and_cabang = raw_pelapor[len(code_prefix):].strip() if code_prefix else raw_pelapor
 
-    # Known cabang patterns (order: longer/more specific first)
-    cabang_patterns = [
-        r'\s+(BANK\s+BUKOPIN\s+\S.*)$',       # BANK BUKOPIN KC TJ.PINANG
-        r'\s+(BANK\s+OCBC\s+NISP\s+\S.*)$',    # BANK OCBC NISP KC BTM-RGC.PARK
-        r'\s+(BANK\s+CIMB\s+NIAGA\s+\S.*)$',   # BANK CIMB NIAGA KPO
-        r'\s+(BPD\s+\w+\s+KC\s+\S.*)$',        # BPD JATIM KC BATAM
-        r'\s+(BMI\s+KC\s+\S.*)$',               # BMI KC TANJUNG PINANG
-        r'\s+(BRI\s+KAS\s+\S.*)$',              # BRI KAS KPO
-        r'\s+(BCA\s+KANTOR\s+\S.*)$',           # BCA KANTOR PUSAT
-        r'\s+(KC\s+\S.*)$',                     # KC Sutami
-        r'\s+(KPO)$',                           # KPO (standalone)
-        r'\s+(Pusat)$',                         # Pusat (standalone)
-    ]
-
     bank_name = name_and_cabang
-    for pattern in cabang_patterns:
-        cabang_hit = re.search(pattern, name_and_cabang, re.IGNORECASE)
-        if cabang_hit:
-            candidate = name_and_cabang[:cabang_hit.start()].strip()
-            # Ensure we don't consume the entire bank name (e.g. "PT" only)
-            if len(candidate) >= 10:
-                bank_name = candidate
-            break
+    cabang_hit = _RE_CABANG.search(name_and_cabang)
+    if cabang_hit:
+        candidate = name_and_cabang[:cabang_hit.start()].strip()
+        # Ensure we don't consume the entire bank name (e.g. "PT" only)
+        if len(candidate) >= 10:
+            bank_name = candidate
 
     # Check for bank name continuation on the next line
     # e.g. "...Rakyat Pusat Rp ...\nCentral Sejahtera\nFeb 24 ..."
-    continuation_match = re.search(
-        r'Rp\s*[\d\.,]+\s+\d{2}\s+\w+\s+\d{4}\s*\n\s*([A-Z][A-Za-z\s\.\(\)]+?)\s*\n',
-        chunk
-    )
+    continuation_match = _RE_CONTINUATION.match(chunk, pelapor_match.end())
     if continuation_match:
         cont_text = continuation_match.group(1).strip()
         # Only accept if it's NOT a month row or section header
-        if not re.match(
-            r'(Feb|Mar|Apr|Mei|Jun|Jul|Agt|Sep|Okt|Nov|Des|Kualitas|No Rekening|Sifat)',
-            cont_text
-        ):
+        if not _RE_NOT_CONTINUATION.match(cont_text):
             bank_name = bank_name + " " + cont_text
 
     data["Pelapor"] = (code_prefix + bank_name).strip()
@@ -246,19 +451,19 @@ def _parse_chunk(chunk: str, nama_debitur: str) -> dict | None:
     data["Kol"] = kol_str
 
     # --- Jumlah Hari Tunggakan ---
-    tunggakan_match = re.search(r'Jumlah Hari Tunggakan\s+(\d+)', chunk)
+    tunggakan_match = _RE_TUNGGAKAN.search(chunk)
     data["Hari Tunggakan"] = tunggakan_match.group(1) if tunggakan_match else "0"
 
     # --- Tanggal Mulai ---
-    tgl_mulai_match = re.search(r'Tanggal Mulai\s+(\d{2}\s+\w+\s+\d{4})', chunk)
+    tgl_mulai_match = _RE_TGL_MULAI.search(chunk)
     data["Tanggal Mulai"] = _format_date_excel(tgl_mulai_match.group(1)) if tgl_mulai_match else "-"
 
     # --- Tanggal Jatuh Tempo ---
-    tgl_jto_match = re.search(r'Tanggal Jatuh Tempo\s+(\d{2}\s+\w+\s+\d{4})', chunk)
+    tgl_jto_match = _RE_TGL_JTO.search(chunk)
     data["Tanggal JTO"] = _format_date_excel(tgl_jto_match.group(1)) if tgl_jto_match else "-"
 
     # --- Plafon Awal ---
-    plafon_match = re.search(r'Plafon Awal\s+Rp\s*([\d\.,]+)', chunk)
+    plafon_match = _RE_PLAFON.search(chunk)
     if plafon_match:
         plafon_int = _parse_currency_to_int(plafon_match.group(1))
         data["Plafon"] = _format_rupiah(plafon_int)
@@ -266,29 +471,29 @@ def _parse_chunk(chunk: str, nama_debitur: str) -> dict | None:
         data["Plafon"] = "-"
 
     # --- Suku Bunga ---
-    bunga_match = re.search(r'Suku Bunga/Imbalan\s+([\d\.,]+)\s*%', chunk)
+    bunga_match = _RE_BUNGA.search(chunk)
     data["Suku Bunga"] = f"{bunga_match.group(1)}%" if bunga_match else "-"
 
     # --- Jenis Penggunaan (Fasilitas) ---
-    fasilitas_match = re.search(r'Jenis Penggunaan\s+(.*?)\s+Frekuensi\s+Restrukturisasi', chunk, re.DOTALL)
+    fasilitas_match = _RE_JENIS_PENGGUNAAN.search(chunk)
     if fasilitas_match:
         fasilitas = fasilitas_match.group(1).strip()
-        fasilitas = re.sub(r'\s+', ' ', fasilitas)
+        fasilitas = _RE_WHITESPACE.sub(' ', fasilitas)
         data["Fasilitas"] = fasilitas
     else:
         data["Fasilitas"] = "-"
 
     # --- Jenis Kredit/Pembiayaan (for Kartu Kredit detection) ---
-    jenis_kredit_match = re.search(r'Jenis Kredit/Pembiayaan\s+(.*?)(?:\n|$)', chunk)
+    jenis_kredit_match = _RE_JENIS_KREDIT.search(chunk)
     is_kartu_kredit = bool(jenis_kredit_match and 'Kartu Kredit' in jenis_kredit_match.group(1))
 
     # --- Agunan (Bukti Kepemilikan + Jenis Agunan) ---
     bukti_items = []
-    bukti_matches = re.findall(r'Bukti Kepemilikan\s+(.*?)(?:\s+Nilai|\n)', chunk)
+    bukti_matches = _RE_BUKTI.findall(chunk)
     bukti_items.extend(m.strip() for m in bukti_matches if m.strip())
 
     jenis_items = []
-    jenis_matches = re.findall(r'Jenis Agunan\s+Nilai Agunan.*?\n\s*(.*?)\s+Rp', chunk)
+    jenis_matches = _RE_JENIS_AGUNAN.findall(chunk)
     jenis_items.extend(m.strip() for m in jenis_matches if m.strip())
 
     if is_kartu_kredit:
@@ -305,6 +510,9 @@ def _parse_chunk(chunk: str, nama_debitur: str) -> dict | None:
 # 3. Agunan Summary Helper
 # ---------------------------------------------------------------------------
 
+_RE_BUKTI_TYPE = re.compile(r'(SHM|SHGB|SKHMT|AJB|BPKB|PPJB|IMB|SIPPT)\b', re.IGNORECASE)
+
+
 def _format_agunan_summary(bukti_items: list, jenis_items: list) -> str:
     """
     Summarise agunan items for display.
@@ -314,15 +522,13 @@ def _format_agunan_summary(bukti_items: list, jenis_items: list) -> str:
     - If a group has <= 3 items  → list them
     - If a group has  > 3 items → just show count, e.g. "6 SHM"
     """
-    from collections import Counter, defaultdict
-
     # --- Group Bukti Kepemilikan by type prefix ---
-    bukti_groups: dict[str, list[str]] = defaultdict(list)
+    bukti_groups: dict[str, list[str]] = {}
     for item in bukti_items:
         # Extract type prefix: "SHM NO 7880" → "SHM", "SHGB.9240" → "SHGB"
-        type_match = re.match(r'(SHM|SHGB|SKHMT|AJB|BPKB|PPJB|IMB|SIPPT)\b', item, re.IGNORECASE)
+        type_match = _RE_BUKTI_TYPE.match(item)
         type_key = type_match.group(1).upper() if type_match else "Lainnya"
-        bukti_groups[type_key].append(item)
+        bukti_groups.setdefault(type_key, []).append(item)
 
     # --- Count Jenis Agunan ---
     jenis_counts = Counter(jenis_items)
@@ -357,6 +563,9 @@ _BULAN = {
     'mei': '05', 'juni': '06', 'juli': '07', 'agustus': '08',
     'september': '09', 'oktober': '10', 'november': '11', 'desember': '12',
 }
+# SLIK prints the names capitalised ("September"); keying those as well
+# saves the lower() call on the common path
+_BULAN_LOOKUP = {**_BULAN, **{name.capitalize(): num for name, num in _BULAN.items()}}
 
 
 def _format_date_excel(date_str: str) -> str:
@@ -365,11 +574,10 @@ def _format_date_excel(date_str: str) -> str:
     which Excel auto-recognises as a date.
     """
     try:
-        parts = date_str.strip().split()
-        if len(parts) != 3:
-            return date_str
-        day, month_name, year = parts
-        month_num = _BULAN.get(month_name.lower(), '00')
+        # split() already drops surrounding whitespace; anything but three
+        # parts fails the unpack
+        day, month_name, year = date_str.split()
+        month_num = _BULAN_LOOKUP.get(month_name) or _BULAN_LOOKUP.get(month_name.lower(), '00')
         return f"{int(day)}/{month_num}/{year}"
     except (ValueError, AttributeError):
         return date_str
@@ -415,27 +623,37 @@ def export_to_excel(df: pd.DataFrame, summary_df: pd.DataFrame = None) -> bytes:
     export_df = df.drop(columns=["Baki Debet (Raw)"], errors="ignore")
 
     output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        export_df.to_excel(writer, index=False, sheet_name='Fasilitas Aktif')
-        _auto_adjust_columns(writer, 'Fasilitas Aktif', export_df)
+    # constant_memory flushes each row as soon as the next one starts, so
+    # the sheets are written row by row here: pandas' to_excel fills cells
+    # column by column and would lose everything but the last column.
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True, "use_zip64": False})
 
-        if summary_df is not None and not summary_df.empty:
-            summary_df.to_excel(writer, index=False, sheet_name='Ringkasan per Debitur')
-            _auto_adjust_columns(writer, 'Ringkasan per Debitur', summary_df)
+    _write_sheet(workbook, 'Fasilitas Aktif', export_df)
+    if summary_df is not None and not summary_df.empty:
+        _write_sheet(workbook, 'Ringkasan per Debitur', summary_df)
 
+    workbook.close()
     return output.getvalue()
 
 
-def _auto_adjust_columns(writer, sheet_name: str, df: pd.DataFrame):
+def _write_sheet(workbook, sheet_name: str, df: pd.DataFrame):
+    """Write a DataFrame (header + rows, no index) to a new worksheet."""
+    worksheet = workbook.add_worksheet(sheet_name)
+    _auto_adjust_columns(worksheet, df)
+
+    worksheet.write_row(0, 0, df.columns)
+    for row, values in enumerate(df.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row, 0, values)
+
+
+def _auto_adjust_columns(worksheet, df: pd.DataFrame):
     """Auto-adjust column widths in an Excel worksheet."""
-    worksheet = writer.sheets[sheet_name]
     for i, col in enumerate(df.columns):
         max_length = max(
-            df[col].astype(str).map(len).max() if len(df) > 0 else 0,
+            df[col].astype(str).str.len().max() if len(df) > 0 else 0,
             len(col)
         ) + 3
-        col_letter = chr(65 + i) if i < 26 else f"A{chr(65 + i - 26)}"
-        worksheet.column_dimensions[col_letter].width = min(max_length, 40)
+        worksheet.set_column(i, i, min(max_length, 40))
 
 
 def build_debtor_summary(df: pd.DataFrame) -> pd.DataFrame:
@@ -445,14 +663,19 @@ def build_debtor_summary(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty or "Baki Debet (Raw)" not in df.columns:
         return pd.DataFrame()
 
-    summary = df.groupby("Nama Debitur").agg(
-        Jumlah_Fasilitas=("Baki Debet (Raw)", "count"),
-        Total_Outstanding=("Baki Debet (Raw)", "sum"),
+    # Cast once so the aggregation runs on an Arrow int64 column;
+    # the group order is re-established by the final sort anyway
+    amounts = df["Baki Debet (Raw)"].astype("int64[pyarrow]", copy=False)
+    summary = amounts.groupby(df["Nama Debitur"], sort=False, observed=True).agg(
+        Jumlah_Fasilitas="size",
+        Total_Outstanding="sum",
     ).reset_index()
 
     summary.columns = ["Nama Debitur", "Jumlah Fasilitas", "Total Outstanding (Raw)"]
     summary["Total Outstanding"] = summary["Total Outstanding (Raw)"].apply(_format_rupiah)
-    summary = summary.sort_values("Total Outstanding (Raw)", ascending=False)
+    summary = summary.sort_values(
+        ["Total Outstanding (Raw)", "Nama Debitur"], ascending=[False, True]
+    )
     summary = summary[["Nama Debitur", "Jumlah Fasilitas", "Total Outstanding", "Total Outstanding (Raw)"]]
 
     return summary